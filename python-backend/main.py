@@ -19,6 +19,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from services.code_analyzer import CodeAnalyzer
 from services.claude_service import ClaudeService
+from services.update_tracker import UpdateTracker
 
 app = FastAPI(
     title="CoDei Backend",
@@ -38,19 +39,28 @@ app.add_middleware(
 # Initialize services
 code_analyzer = CodeAnalyzer()
 claude_service = ClaudeService()
+update_tracker = UpdateTracker()
 
 # Note: In production, you would start the uAgent separately:
 # uagent run agents.tutor_agent:tutor_agent
 
 class CodeUpdate(BaseModel):
-    code: str
+    code: Optional[str] = None
     context: Optional[str] = None
     language: Optional[str] = "python"
+    # Conditional requests: send content_hash alone first, the full payload only if asked
+    content_hash: Optional[str] = None
+    client_id: Optional[str] = None
 
 class Response(BaseModel):
     question: Optional[str]
     analysis: dict
     needs_conceptual_help: bool
+    content_hash: Optional[str] = None
+    unchanged: bool = False
+    needs_content: bool = False
+    fallback: bool = False
+    next_poll_seconds: Optional[float] = None
 
 def _looks_like_code(text: str) -> bool:
     """Check if the input looks like code"""
@@ -87,39 +97,120 @@ async def root():
 async def code_update(update: CodeUpdate):
     """
     Receive code update, analyze it, and return Socratic question if needed.
+
+    Clients that send a content_hash get conditional handling: a hash we have
+    already answered returns the cached result, flagged unchanged=True when it
+    repeats the same client's previous poll. An unknown hash without code
+    returns needs_content=True so the client resends the full payload. When
+    Claude fails the response is flagged fallback=True and the hash is held
+    back for a growing interval instead of being retried on the next poll.
+    Conditional responses also carry next_poll_seconds.
     """
+    if update.code is None and not update.content_hash:
+        raise HTTPException(status_code=400, detail="Either code or content_hash is required")
+
+    conditional = bool(update.content_hash)
+    content_hash = None
+    next_poll_seconds = None
+
+    if conditional:
+        if update.code is not None:
+            content_hash = UpdateTracker.fingerprint(update.code, update.context, update.language)
+        else:
+            content_hash = update.content_hash
+        cached = update_tracker.lookup(content_hash)
+        repeat, next_poll_seconds = update_tracker.observe(
+            update.client_id, content_hash, cached=cached is not None
+        )
+
+        # The cache is shared, so a client seeing this hash for the first time still gets it as new
+        if cached is not None:
+            return Response(
+                **cached,
+                content_hash=content_hash,
+                unchanged=repeat,
+                next_poll_seconds=next_poll_seconds
+            )
+
+        # Claude recently failed on this hash: don't resend or retry until the backoff expires
+        retry_after = update_tracker.retry_after(content_hash)
+        if retry_after is not None:
+            return Response(
+                question=None,
+                analysis={},
+                needs_conceptual_help=False,
+                content_hash=content_hash,
+                fallback=True,
+                next_poll_seconds=max(next_poll_seconds, round(retry_after, 1))
+            )
+
+        if update.code is None:
+            return Response(
+                question=None,
+                analysis={},
+                needs_conceptual_help=False,
+                content_hash=content_hash,
+                needs_content=True,
+                next_poll_seconds=next_poll_seconds
+            )
+
     try:
         # Step 1: Let CodeMentor intelligently handle any input (code, questions, chat, etc.)
         # No hardcoding - CodeMentor will figure it out based on the sophisticated prompt
         
         needs_conceptual_help = False
         question = None
+        claude_failed = False
         
-        # Try to analyze if it looks like code first (optional check)
-        try:
-            analysis = code_analyzer.analyze(update.code, update.language)
-            needs_conceptual_help = analysis.get("has_conceptual_issue", False)
-            issue_type = analysis.get("issue_type", "general")
-        except:
-            # If analysis fails, just send everything to CodeMentor
-            analysis = {"has_errors": False, "errors": []}
-            issue_type = "general"
+        with update_tracker.processing():
+            # Try to analyze if it looks like code first (optional check)
+            try:
+                analysis = code_analyzer.analyze(update.code, update.language)
+                needs_conceptual_help = analysis.get("has_conceptual_issue", False)
+                issue_type = analysis.get("issue_type", "general")
+            except:
+                # If analysis fails, just send everything to CodeMentor
+                analysis = {"has_errors": False, "errors": []}
+                issue_type = "general"
+            
+            # Step 2: Send to Claude
+            # Conditional clients need to tell a failure (None) apart from a real answer
+            generate = claude_service.request_socratic_question if conditional else claude_service.generate_socratic_question
+            try:
+                question = await generate(
+                    code=update.code,
+                    issue_type=issue_type,
+                    context=update.context or ""
+                )
+                claude_failed = conditional and question is None
+            except Exception as e:
+                print(f"Error calling Claude API: {e}")
+                question = "I'm here to help you learn! What can I help you with today?"
+                claude_failed = conditional
         
-        # Step 2: Send to Claude
-        try:
-            question = await claude_service.generate_socratic_question(
-                code=update.code,
-                issue_type=issue_type,
-                context=update.context or ""
-            )
-        except Exception as e:
-            print(f"Error calling Claude API: {e}")
-            question = "I'm here to help you learn! What can I help you with today?"
+        # Plain requests (chat) are left as they were; only polling clients get backoff
+        if conditional:
+            if claude_failed:
+                # Don't cache fallback answers; back off instead so the retry isn't immediate
+                backoff = update_tracker.record_failure(content_hash)
+                next_poll_seconds = max(next_poll_seconds, backoff)
+                if question is None:
+                    question = "I'm here to help you learn! What can I help you with today?"
+            else:
+                update_tracker.record_success(content_hash)
+                update_tracker.store(content_hash, {
+                    "question": question,
+                    "analysis": analysis,
+                    "needs_conceptual_help": needs_conceptual_help
+                })
         
         return Response(
             question=question,
             analysis=analysis,
-            needs_conceptual_help=needs_conceptual_help
+            needs_conceptual_help=needs_conceptual_help,
+            content_hash=content_hash,
+            fallback=claude_failed,
+            next_poll_seconds=next_poll_seconds
         )
     
     except Exception as e:
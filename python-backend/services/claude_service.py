@@ -3,6 +3,7 @@ Claude API Service
 Uses Anthropic's Claude for intelligent responses
 """
 
+import asyncio
 import os
 from typing import Optional
 
@@ -74,6 +75,16 @@ Your purpose: behave like ChatGPT in all contexts, but when code appears or a pr
     
     async def generate_socratic_question(self, code: str, issue_type: str, context: str = "") -> Optional[str]:
         """Generate response using Claude API"""
+        if not self.enabled or not self.client:
+            return None
+        
+        response = await self.request_socratic_question(code, issue_type, context)
+        if response is None:
+            return "I'm here to help! What can I assist you with?"
+        return response
+    
+    async def request_socratic_question(self, code: str, issue_type: str, context: str = "") -> Optional[str]:
+        """Like generate_socratic_question, but returns None when Claude is disabled or fails"""
         try:
             if not self.enabled or not self.client:
                 return None
@@ -87,7 +98,9 @@ Your purpose: behave like ChatGPT in all contexts, but when code appears or a pr
             print("="*80 + "\n")
             
             # Call Claude API
-            message = self.client.messages.create(
+            # The SDK call blocks, so run it off the event loop to let other requests proceed
+            message = await asyncio.to_thread(
+                self.client.messages.create,
                 model="claude-3-haiku-20240307",  # Claude 3 Haiku
                 max_tokens=500,
                 temperature=0.7,
@@ -111,4 +124,4 @@ Your purpose: behave like ChatGPT in all contexts, but when code appears or a pr
             
         except Exception as e:
             print(f"❌ Error calling Claude API: {e}")
-            return "I'm here to help! What can I assist you with?"
+            return None
@@ -0,0 +1,130 @@
+"""
+Update Tracker Service
+Fingerprints code updates so repeated payloads can skip analysis, and
+suggests how long each client should wait before polling again
+"""
+
+import hashlib
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, Any, Optional, Tuple
+
+class UpdateTracker:
+    """Caches responses by content hash and adapts client poll intervals"""
+
+    MIN_POLL_SECONDS = 5.0
+    BASE_POLL_SECONDS = 10.0
+    MAX_POLL_SECONDS = 120.0
+
+    # Intervals grow linearly with in-flight analyses (x1 + n / LOAD_SOFT_LIMIT),
+    # reaching double at LOAD_SOFT_LIMIT. Only this process's requests are counted.
+    LOAD_SOFT_LIMIT = 8
+
+    def __init__(self, max_entries: int = 512, max_clients: int = 4096):
+        self.max_entries = max_entries
+        self.max_clients = max_clients
+        self.responses: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.clients: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.in_flight = 0
+        # Hashes whose answer failed, mapped to when they may be retried
+        self.failures: "OrderedDict[str, float]" = OrderedDict()
+        self.consecutive_failures = 0
+
+    @staticmethod
+    def fingerprint(code: str, context: Optional[str] = "", language: Optional[str] = "python") -> str:
+        """Hash a payload exactly the way clients do: sha256 of code, context and language joined by NUL"""
+        payload = "\0".join([code or "", context or "", language or ""])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, content_hash: str) -> Optional[Dict[str, Any]]:
+        """Return the cached response for a content hash, if we have one"""
+        cached = self.responses.get(content_hash)
+        if cached is not None:
+            self.responses.move_to_end(content_hash)
+        return cached
+
+    def store(self, content_hash: str, response: Dict[str, Any]):
+        """Remember the response for a content hash, evicting the oldest entry when full"""
+        self.responses[content_hash] = response
+        self.responses.move_to_end(content_hash)
+        while len(self.responses) > self.max_entries:
+            self.responses.popitem(last=False)
+
+    def record_failure(self, content_hash: Optional[str]) -> float:
+        """
+        Hold off retrying a hash whose answer failed and return the wait in seconds.
+        The wait doubles with each consecutive failure, so an outage backs everyone off.
+        """
+        self.consecutive_failures += 1
+        backoff = min(self.BASE_POLL_SECONDS * (2 ** min(self.consecutive_failures - 1, 8)), self.MAX_POLL_SECONDS)
+        if content_hash:
+            self.failures[content_hash] = time.time() + backoff
+            self.failures.move_to_end(content_hash)
+            while len(self.failures) > self.max_entries:
+                self.failures.popitem(last=False)
+        return backoff
+
+    def record_success(self, content_hash: Optional[str]):
+        """Clear failure backoff after a real answer"""
+        self.consecutive_failures = 0
+        if content_hash:
+            self.failures.pop(content_hash, None)
+
+    def retry_after(self, content_hash: str) -> Optional[float]:
+        """Seconds until a failed hash may be retried, or None if it may be retried now"""
+        retry_at = self.failures.get(content_hash)
+        if retry_at is None:
+            return None
+        remaining = retry_at - time.time()
+        if remaining <= 0:
+            del self.failures[content_hash]
+            return None
+        return remaining
+
+    @contextmanager
+    def processing(self):
+        """Count a full analysis as backend load while it runs"""
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+
+    def observe(self, client_id: Optional[str], content_hash: Optional[str], cached: bool) -> Tuple[bool, float]:
+        """
+        Record a client's poll and return (repeat, seconds until its next poll).
+
+        repeat is True when the client's previous poll carried the same hash.
+        A poll counts as idle when it is a repeat and we already had an answer
+        for it. Active clients poll every MIN_POLL_SECONDS; each idle poll
+        doubles the interval up to MAX_POLL_SECONDS. The result is then
+        stretched linearly by the number of analyses in flight in this process.
+        """
+        interval = self.BASE_POLL_SECONDS
+        repeat = False
+
+        if client_id:
+            state = self.clients.get(client_id)
+            if state is None:
+                state = {"last_hash": None, "unchanged_streak": 0}
+
+            repeat = content_hash == state["last_hash"]
+            if cached and repeat:
+                state["unchanged_streak"] += 1
+            else:
+                state["unchanged_streak"] = 0
+            state["last_hash"] = content_hash
+
+            self.clients[client_id] = state
+            self.clients.move_to_end(client_id)
+            while len(self.clients) > self.max_clients:
+                self.clients.popitem(last=False)
+
+            if state["unchanged_streak"] == 0:
+                interval = self.MIN_POLL_SECONDS
+            else:
+                interval = self.BASE_POLL_SECONDS * (2 ** min(state["unchanged_streak"] - 1, 8))
+
+        load_factor = 1.0 + self.in_flight / self.LOAD_SOFT_LIMIT
+        return repeat, round(min(interval * load_factor, self.MAX_POLL_SECONDS), 1)
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# Make the backend packages importable, the same way main.py does
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
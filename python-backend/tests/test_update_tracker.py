@@ -0,0 +1,138 @@
+"""
+Tests for the UpdateTracker service
+"""
+
+import asyncio
+
+from services import update_tracker as update_tracker_module
+from services.update_tracker import UpdateTracker
+
+# node -e "require('crypto').createHash('sha256').update(['x=1','c','python'].join('\0'),'utf8').digest('hex')"
+JS_FINGERPRINT = "6604e77c5404fcad3a51c9f9f59d9cbc54d9ca547db3135dafb300f8d4df3bde"
+
+
+def test_fingerprint_matches_client():
+    assert UpdateTracker.fingerprint("x=1", "c", "python") == JS_FINGERPRINT
+
+
+def test_fingerprint_treats_none_as_empty():
+    assert UpdateTracker.fingerprint("x=1", None, None) == UpdateTracker.fingerprint("x=1", "", "")
+
+
+def test_responses_evict_least_recently_used():
+    tracker = UpdateTracker(max_entries=2)
+    tracker.store("a", {"question": "a"})
+    tracker.store("b", {"question": "b"})
+    tracker.lookup("a")
+    tracker.store("c", {"question": "c"})
+
+    assert tracker.lookup("b") is None
+    assert tracker.lookup("a") == {"question": "a"}
+    assert tracker.lookup("c") == {"question": "c"}
+
+
+def test_clients_evict_least_recently_seen():
+    tracker = UpdateTracker(max_clients=2)
+    tracker.observe("a", "h", cached=False)
+    tracker.observe("b", "h", cached=False)
+    tracker.observe("a", "h", cached=False)
+    tracker.observe("c", "h", cached=False)
+
+    assert list(tracker.clients) == ["a", "c"]
+
+
+def test_failures_evict_oldest():
+    tracker = UpdateTracker(max_entries=2)
+    for content_hash in ["a", "b", "c"]:
+        tracker.record_failure(content_hash)
+
+    assert list(tracker.failures) == ["b", "c"]
+
+
+def test_changing_content_polls_at_minimum():
+    tracker = UpdateTracker()
+    intervals = [tracker.observe("a", h, cached=False)[1] for h in ["h1", "h2", "h3"]]
+
+    assert intervals == [UpdateTracker.MIN_POLL_SECONDS] * 3
+
+
+def test_idle_polls_double_up_to_cap():
+    tracker = UpdateTracker()
+    tracker.observe("a", "h", cached=False)
+    intervals = [tracker.observe("a", "h", cached=True)[1] for _ in range(7)]
+
+    assert intervals == [10.0, 20.0, 40.0, 80.0, 120.0, 120.0, 120.0]
+
+
+def test_uncached_repeat_does_not_back_off():
+    tracker = UpdateTracker()
+    tracker.observe("a", "h", cached=False)
+
+    assert tracker.observe("a", "h", cached=False)[1] == UpdateTracker.MIN_POLL_SECONDS
+
+
+def test_anonymous_client_gets_base_interval():
+    tracker = UpdateTracker()
+
+    assert tracker.observe(None, "h", cached=True) == (False, UpdateTracker.BASE_POLL_SECONDS)
+
+
+def test_repeat_only_for_same_client():
+    tracker = UpdateTracker()
+
+    assert tracker.observe("a", "h", cached=True)[0] is False
+    assert tracker.observe("a", "h", cached=True)[0] is True
+    assert tracker.observe("b", "h", cached=True)[0] is False
+    assert tracker.observe("a", "other", cached=True)[0] is False
+
+
+def test_load_stretches_interval():
+    tracker = UpdateTracker()
+    with tracker.processing(), tracker.processing(), tracker.processing(), tracker.processing():
+        _, interval = tracker.observe("a", "h", cached=False)
+
+    assert interval == 7.5
+    assert tracker.in_flight == 0
+
+
+def test_load_is_seen_by_concurrent_polls():
+    tracker = UpdateTracker()
+
+    async def analysis():
+        with tracker.processing():
+            await asyncio.sleep(0.05)
+
+    async def poll():
+        await asyncio.sleep(0.01)
+        return tracker.observe("a", "h", cached=False)[1]
+
+    async def run():
+        results = await asyncio.gather(analysis(), analysis(), poll())
+        return results[-1]
+
+    assert asyncio.run(run()) > UpdateTracker.MIN_POLL_SECONDS
+
+
+def test_failure_backoff_doubles_and_resets():
+    tracker = UpdateTracker()
+    backoffs = [tracker.record_failure("h") for _ in range(6)]
+    assert backoffs == [10.0, 20.0, 40.0, 80.0, 120.0, 120.0]
+
+    tracker.record_success("h")
+    assert tracker.retry_after("h") is None
+    assert tracker.record_failure("h") == UpdateTracker.BASE_POLL_SECONDS
+
+
+def test_retry_after_expires(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(update_tracker_module.time, "time", lambda: now[0])
+    tracker = UpdateTracker()
+    tracker.record_failure("h")
+
+    assert tracker.retry_after("h") == 10.0
+    now[0] += 4
+    assert tracker.retry_after("h") == 6.0
+    now[0] += 6
+    assert tracker.retry_after("h") is None
+    assert "h" not in tracker.failures
+    assert tracker.retry_after("other") is None
@@ -1,6 +1,7 @@
 const { screen, desktopCapturer } = require('electron');
 const EventEmitter = require('events');
 const axios = require('axios');
+const crypto = require('crypto');
 const fs = require('fs');
 const path = require('path');
 
@@ -8,7 +9,10 @@ class ScreenReaderEnhanced extends EventEmitter {
   constructor(claudeBackendUrl = 'http://127.0.0.1:8000', personality = 'mentor') {
     super();
     this.isReading = false;
-    this.readInterval = null;
+    this.readTimer = null;
+    this.pollIntervalMs = 10000;  // Backend suggests the next interval via next_poll_seconds
+    this.clientId = crypto.randomUUID();
+    this.lastCapturedCode = null;  // Normalized code from the previous capture (debounce)
     this.lastContent = '';
     this.lastDetectedContext = null;  // Store screen context (passive mode)
     this.claudeBackendUrl = claudeBackendUrl;  // Claude backend (not old rag-service)
@@ -41,23 +45,35 @@ class ScreenReaderEnhanced extends EventEmitter {
   async startReading() {
     this.isReading = true;
     
-    // Read the screen every 10 seconds to see updates faster
-    this.readInterval = setInterval(() => {
-      this.captureAndAnalyze();
-    }, 10000);
+    // Do an initial read immediately, then follow the backend's suggested interval
+    this.readLoop();
     
-    // Do an initial read immediately
-    this.captureAndAnalyze();
-    
-    this.safeLog('📸 Enhanced screen reading started - scanning every 10 seconds...');
+    this.safeLog('📸 Enhanced screen reading started - scanning every 10 seconds (adapts to activity)...');
     this.safeLog('👀 Looking for any text and code on your screen');
   }
 
+  async readLoop() {
+    if (!this.isReading) return;
+    
+    await this.captureAndAnalyze();
+    
+    // Schedule after each read finishes so slow OCR/backend calls never overlap
+    if (this.isReading) {
+      this.readTimer = setTimeout(() => this.readLoop(), this.pollIntervalMs);
+    }
+  }
+
+  // Adopt the backend's next_poll_seconds, clamped so a bad value can't stall or flood
+  applyPollInterval(nextPollSeconds) {
+    if (typeof nextPollSeconds !== 'number' || !isFinite(nextPollSeconds)) return;
+    this.pollIntervalMs = Math.min(Math.max(nextPollSeconds * 1000, 5000), 120000);
+  }
+
   stopReading() {
     this.isReading = false;
-    if (this.readInterval) {
-      clearInterval(this.readInterval);
-      this.readInterval = null;
+    if (this.readTimer) {
+      clearTimeout(this.readTimer);
+      this.readTimer = null;
     }
     this.safeLog('📸 Screen reading stopped');
   }
@@ -133,6 +149,26 @@ class ScreenReaderEnhanced extends EventEmitter {
         if (ocrResult.isCoding) {
           this.safeLog(`🎯 Coding content detected! Topic: ${ocrResult.topic}`);
           this.safeLog(`💻 Code found: ${ocrResult.code ? ocrResult.code.substring(0, 150) : '(no code)'}...`);
+          
+          // Only send code that is the same on two captures in a row, so OCR jitter
+          // and mid-edit screens don't each become a new Claude call
+          const code = this.normalizeCode(ocrResult.code);
+          if (code !== this.lastCapturedCode) {
+            this.lastCapturedCode = code;
+            // Come back soon to confirm the change instead of waiting out an idle backoff
+            this.pollIntervalMs = Math.min(this.pollIntervalMs, 10000);
+          } else if (code) {
+            // Backend answers unchanged content from its cache, so only new hints are emitted
+            const hints = await this.generateHints(code, ocrResult.topic);
+            if (!hints.unchanged && !hints.fallback) {
+              this.emit('contentDetected', {
+                topic: ocrResult.topic,
+                question: ocrResult.question,
+                code: ocrResult.code,
+                hints: hints
+              });
+            }
+          }
         }
         
         this.safeLog(`💾 Screen context stored (${ocrResult.extractedText.length} chars)`);
@@ -146,6 +182,15 @@ class ScreenReaderEnhanced extends EventEmitter {
     }
   }
   
+  // Strip whitespace differences OCR introduces between captures of the same screen
+  normalizeCode(code) {
+    return (code || '')
+      .split('\n')
+      .map(line => line.trim().replace(/\s+/g, ' '))
+      .filter(line => line.length > 0)
+      .join('\n');
+  }
+  
   // Public method to get current screen context for chat
   getCurrentContext() {
     return this.lastDetectedContext || null;
@@ -315,26 +360,49 @@ class ScreenReaderEnhanced extends EventEmitter {
       // Send captured screen data to Claude backend for Socratic hints
       const contextMessage = `Problem Topic: ${topic}\n\nCode:\n${code}\n\nStudent's Approach: ${userApproach || 'Not yet determined'}\n\nPotential Issues: ${misconceptions || 'None detected'}`;
       
-      this.safeLog(`🤖 Sending to Claude backend: ${this.claudeBackendUrl}/api/code_update`);
+      const payload = {
+        code: contextMessage,
+        context: `The student is working on a ${topic} problem on LeetCode. Provide a Socratic hint to guide their thinking.`,
+        language: 'python'  // Claude will auto-detect actual language
+      };
+      
+      // Send only the fingerprint first; the backend asks for the full payload if it hasn't seen it
+      const contentHash = crypto.createHash('sha256')
+        .update([payload.code, payload.context, payload.language].join('\0'), 'utf8')
+        .digest('hex');
       
-      const response = await axios.post(
+      let response = await axios.post(
         `${this.claudeBackendUrl}/api/code_update`,
-        {
-          code: contextMessage,
-          context: `The student is working on a ${topic} problem on LeetCode. Provide a Socratic hint to guide their thinking.`,
-          language: 'python'  // Claude will auto-detect actual language
-        },
+        { content_hash: contentHash, client_id: this.clientId },
         { timeout: 15000 }
       );
+      
+      if (response.data && response.data.needs_content) {
+        this.safeLog(`🤖 Sending to Claude backend: ${this.claudeBackendUrl}/api/code_update`);
+        
+        response = await axios.post(
+          `${this.claudeBackendUrl}/api/code_update`,
+          { ...payload, content_hash: contentHash, client_id: this.clientId },
+          { timeout: 15000 }
+        );
+      }
+      
+      if (response.data) {
+        this.applyPollInterval(response.data.next_poll_seconds);
+      }
 
-      if (response.data && response.data.question) {
+      // fallback marks the backend's generic text when Claude failed - not a real hint
+      if (response.data && response.data.question && !response.data.fallback) {
         // Claude's Socratic response
         const claudeHint = response.data.question;
         
-        this.safeLog(`✅ Claude responded: ${claudeHint.substring(0, 80)}...`);
+        if (!response.data.unchanged) {
+          this.safeLog(`✅ Claude responded: ${claudeHint.substring(0, 80)}...`);
+        }
         
         return {
           topic: topic,
+          unchanged: Boolean(response.data.unchanged),
           personality: this.personality,
           knowledgeBaseHints: [],
           progressiveHints: [
@@ -353,6 +421,7 @@ class ScreenReaderEnhanced extends EventEmitter {
     // Fallback hints (when Claude is unavailable)
     return {
       topic: topic,
+      fallback: true,
       personality: this.personality,
       knowledgeBaseHints: [
         "Break down the problem into smaller steps.",